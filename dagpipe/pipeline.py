@@ -6,9 +6,72 @@ Classes:
     Pipeline: A class representing a pipeline of tasks to be executed in order.
 """
 
+import functools
+import keyword
+import operator
 import re
-from typing import Any, Callable, Iterable
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator
 from dagpipe.task_core import Task, TaskReference
+from dagpipe.utils import ResultsCache, evaluate_memoized
+
+
+_REPR_RE = re.compile(r"Task.*<([^>]*)>")
+_evaluated_result = operator.attrgetter("evaluated_result")
+
+
+def _parse_tuple(args: tuple) -> tuple[tuple, dict]:
+    if (
+        (len(args) == 2)
+        and isinstance(args[0], tuple)
+        and isinstance(args[1], dict)
+    ):
+        return args
+    return args, {}
+
+
+def _parse_dict(kwargs: dict) -> tuple[tuple, dict]:
+    return tuple(), kwargs
+
+
+def _parse_scalar(arg: Any) -> tuple[tuple, dict]:
+    return (arg, ), {}
+
+
+# Exact type lookup is the fast path, subclasses are handled in '_parse_args_or_kwargs'.
+_PARSERS = {tuple: _parse_tuple, dict: _parse_dict}
+
+
+_COMPILABLE_RUNS = (Task.run, TaskReference.run)
+
+
+def _source_task(task: Task) -> Task:
+    """Return task which is executed when the given task is run."""
+    return task.task if isinstance(task, TaskReference) else task
+
+
+def _call_source(task: Task, task_var: str, result_vars: dict[int, str]) -> str:
+    """
+    Build source code of 'evaluate_result' call for a task stored in task_var.
+    Task arguments are replaced with variables from result_vars,
+    other arguments are read from the task itself.
+    """
+    def arg_source(value, stored_at: str) -> str:
+        if isinstance(value, Task):
+            return result_vars.get(id(value), f"{stored_at}.evaluated_result")
+        return stored_at
+
+    call_args = [
+        arg_source(arg, f"{task_var}.args[{i}]") for i, arg in enumerate(task.args)
+    ]
+    for key, value in task.kwargs.items():
+        value_source = arg_source(value, f"{task_var}.kwargs[{key!r}]")
+        if key.isidentifier() and not keyword.iskeyword(key):
+            call_args.append(f"{key}={value_source}")
+        else:
+            call_args.append(f"**{{{key!r}: {value_source}}}")
+    return f"{task_var}.evaluate_result({', '.join(call_args)})"
 
 
 class Pipeline:
@@ -24,7 +87,8 @@ class Pipeline:
     def __init__(self, 
                  inputs: Task | list[Task],
                  outputs: Task | list[Task],
-                 conditional_stops: dict[str, Callable[[Any], bool]] = None):
+                 conditional_stops: dict[str, Callable[[Any], bool]] = None,
+                 cache: bool | set[str] = False):
         """
         Initialize a Pipeline instance.
 
@@ -34,19 +98,58 @@ class Pipeline:
             conditional_stops (dict, Optional): key - task name
                 function that would be evaluated on task output.
                 If it returns true, then pipeline execution would be early stopped.
+            cache (bool | set[str], Optional): If True, results of all tasks
+                are memoized by their evaluated arguments, so task is not
+                executed again when called with the same inputs.
+                If set of names is given, only tasks with these names are memoized.
+                Tasks created with cacheable=True keep using their own cache
+                and are not memoized again by the pipeline.
+                Use only for tasks which are pure functions.
         """
-        self.inputs: list[Task] = self._uniform_to_list(inputs, Task)
-        self.outputs: list[Task] = self._uniform_to_list(outputs, Task)
-        self.tasks: list[Task] = self._gather_tasks()
+        self.__setup(
+            self._uniform_to_list(inputs, Task),
+            self._uniform_to_list(outputs, Task),
+            conditional_stops,
+            cache,
+        )
+
+    @classmethod
+    def _from_validated(cls,
+                        inputs: list[Task],
+                        outputs: list[Task],
+                        conditional_stops: dict[str, Callable[[Any], bool]] = None,
+                        cache: bool | set[str] = False):
+        """Create a Pipeline from lists already known to contain only tasks,
+        skipping the validation done in __init__."""
+        pipeline = cls.__new__(cls)
+        pipeline.__setup(inputs, outputs, conditional_stops, cache)
+        return pipeline
+
+    def __setup(self, inputs, outputs, conditional_stops, cache):
+        self.inputs: list[Task] = inputs
+        self.outputs: list[Task] = outputs
+        self._input_ids = {id(input_) for input_ in inputs}
         self.conditional_stops = conditional_stops
+        self._stops_snapshot = None
+        self._stop_by_id_table = {}
+        self.cache = cache
+        self._cache_snapshot = None
+        self._cached_ids_table = set()
+        self._results_cache: dict[int, ResultsCache] = {}
+        self._compiled = None
         self._have_multi_input = (len(self.inputs) > 1)
+        self._setup_input = (
+            self._setup_multi_input if self._have_multi_input else self._setup_single_input)
 
     @staticmethod
     def _uniform_to_list(inputs, parsed_type: type):
         if isinstance(inputs, parsed_type):
             return [inputs]
         if isinstance(inputs, list):
-            if all(isinstance(t, parsed_type) for t in inputs):
+            for t in inputs:
+                if not isinstance(t, parsed_type):
+                    break
+            else:
                 return inputs
         raise ValueError(f"Only {parsed_type} type or lists of {parsed_type}s are acceptable. Got {inputs}")
 
@@ -77,76 +180,153 @@ class Pipeline:
         Returns:
             Pipeline: A Pipeline instance with the tasks set to execute in sequence.
         """
-        tasks_sequence = list(tasks_sequence)
-        input_task = tasks_sequence.pop(0)
+        tasks_sequence = deque(tasks_sequence)
+        input_task = tasks_sequence.popleft()
         input_ = input_task(Any)
         x = input_
         for task in tasks_sequence:
             x = task(x)
-        return cls(input_, x, conditional_stops)
+        return cls._from_validated([input_], [x], conditional_stops)
 
     def __getitem__(self, name: str) -> Task:
-        repr_format_match = re.search(r"^.*Task.*<(.*)>", name)
-        if repr_format_match:
-            name = repr_format_match.groups()[0]
+        name = self.__strip_task_name_if_needed(name)
+        try:
+            return self._by_name[name][0]
+        except KeyError:
+            raise KeyError(f"Task with name {name} not found in self.tasks") from None
+
+    @staticmethod
+    def __strip_task_name_if_needed(name: str) -> str:
+        """Extract task name from its repr, e.g. 'Task<name>' -> 'name'."""
+        if "<" not in name:
+            return name
+        repr_format_match = _REPR_RE.search(name)
+        return repr_format_match.group(1) if repr_format_match else name
+
+    @functools.cached_property
+    def tasks(self) -> list[Task]:
+        """The list of tasks in the order they should be executed.
+        Gathered lazily on first access and cached afterwards."""
+        return self._gather_tasks()
+
+    @property
+    def _stop_by_id(self) -> dict[int, Callable[[Any], bool]]:
+        """
+        Conditional stops keyed by id of the task they are evaluated on.
+        Rebuilt when conditional_stops was replaced or modified since the last access.
+        """
+        conditional_stops = self.conditional_stops or {}
+        if conditional_stops != self._stops_snapshot:
+            self._stops_snapshot = dict(conditional_stops)
+            self._stop_by_id_table = {
+                id(task): conditional_stops[task.name]
+                for task in self.tasks
+                if task.name in conditional_stops
+            }
+        return self._stop_by_id_table
+
+    @functools.cached_property
+    def _by_name(self) -> dict[str, list[Task]]:
+        """Tasks, and tasks behind TaskReferences, grouped by their names."""
+        by_name = dict()
         tasks_from_references = [t.task for t in self.tasks if isinstance(t, TaskReference)]
         for task in self.tasks + tasks_from_references:
-            if task.name == name:
-                return task
-        raise KeyError(f"Task with name {name} not found in self.tasks")
+            by_name.setdefault(task.name, []).append(task)
+        return by_name
+
+    @property
+    def _cached_ids(self) -> set[int]:
+        """
+        Ids of tasks which results are memoized.
+        Names in cache are matched with tasks and with tasks behind TaskReferences,
+        and all references to a memoized task are memoized together.
+        Rebuilt when cache was replaced or modified since the last access.
+        """
+        cache = self.cache
+        if cache and not isinstance(cache, bool):
+            cache = frozenset(cache)
+        if cache != self._cache_snapshot:
+            self._cache_snapshot = cache
+            if not cache:
+                cached_source_ids = set()
+            else:
+                cached_source_ids = {
+                    id(_source_task(task)) for task in self.tasks
+                    if not _source_task(task).cacheable and (
+                        cache is True or task.name in cache or _source_task(task).name in cache)
+                }
+            self._cached_ids_table = {
+                id(task) for task in self.tasks if id(_source_task(task)) in cached_source_ids
+            }
+        return self._cached_ids_table
 
     def _gather_tasks(self) -> list[Task]:
         """
         Gather all tasks in the pipeline in the order they should be executed.
 
+        Tasks are ordered with Kahn's algorithm run from outputs towards
+        inputs, so every task appears after all of its parents and
+        sibling tasks keep the order of arguments they were passed in.
+
         Returns:
             list[Task]: The list of tasks in execution order.
+
+        Raises:
+            RuntimeError: If tasks form a cycle, or some input
+                is not connected with outputs.
         """
-        children_num = self.__count_tasks_children()
-        tasks = self.__order_tasks(children_num)
-        self.__assert_all_inputs_seen(tasks)
+        children_num, reachable = self.__collect_graph()
+        stack = list({
+            id(output): output for output in self.outputs if children_num[id(output)] == 0
+        }.values())
+        tasks = []
+        seen_input_ids = set()
+        while stack:
+            current_task = stack.pop()
+            tasks.append(current_task)
+            if id(current_task) in self._input_ids:
+                seen_input_ids.add(id(current_task))
+            for parent in current_task.parent_tasks:
+                children_num[id(parent)] -= 1
+                if children_num[id(parent)] == 0:
+                    stack.append(parent)
+        if len(tasks) != len(reachable):
+            unordered = [task for task in reachable if children_num[id(task)] > 0]
+            raise RuntimeError(
+                "Unable to build graph. "
+               f"Tasks {unordered} are part of a cycle or lead into one."
+            )
+        tasks.reverse()
+        self.__assert_all_inputs_seen(seen_input_ids)
         return tasks
 
-    def __assert_all_inputs_seen(self, tasks):
+    def __assert_all_inputs_seen(self, seen_ids: set[int]):
         for input_ in self.inputs:
-            if not input_ in tasks:
+            if id(input_) not in seen_ids:
                 raise RuntimeError(
                     "Unable to build graph. "
                    f"No connection between {input_} and {self.outputs} found. "
                     "Verify if pipeline is builded correctly."
                 )
-        
-    def __count_tasks_children(self):
+
+    def __collect_graph(self) -> tuple[dict[int, int], list[Task]]:
+        """Find tasks reachable from outputs and count children of each of them."""
         children_num = dict()
-        seen = set()
+        visited = set()
+        reachable = []
         stack = list(self.outputs)
         while stack:
             current_task = stack.pop()
-            if current_task not in seen:
-                seen.add(current_task)
-                for parent in current_task.args + tuple(current_task.kwargs.values()):
-                    if isinstance(parent, Task):
-                        stack.append(parent)
-                        children_num[id(parent)] = children_num.get(id(parent), 0) + 1
-        return children_num
-    
-    def __order_tasks(self, children_num):
-        tasks = []
-        seen = set(self.outputs)
-        stack = list(self.outputs)
-        while stack:
-            current_task = stack.pop()
-            tasks.append(current_task)
-            seen.add(current_task)
-            for parent in current_task.args + tuple(current_task.kwargs.values()):
-                if isinstance(parent, Task):
-                    children_num[id(parent)] = children_num.get(id(parent), 0) - 1
-                    if children_num[id(parent)] == 0: #and (parent not in seen):
-                        stack.append(parent)
-                        seen.add(parent)
-        tasks.reverse()
-        return tasks
-
+            if id(current_task) in visited:
+                continue
+            visited.add(id(current_task))
+            reachable.append(current_task)
+            children_num.setdefault(id(current_task), 0)
+            parents = current_task.parent_tasks
+            for parent in parents:
+                children_num[id(parent)] = children_num.get(id(parent), 0) + 1
+            stack.extend(parents)
+        return children_num, reachable
 
     def run(self, *single_input_args, **single_or_multi_input_kwargs) -> list[Task]:
         """
@@ -169,46 +349,250 @@ class Pipeline:
         Returns:
             list: The evaluated results of the output tasks.
         """
+        stopped_task = self._execute(single_input_args, single_or_multi_input_kwargs)
+        if stopped_task is not None:
+            return [stopped_task.evaluated_result, (stopped_task.to_stopping_holder())]
+        return list(map(_evaluated_result, self.outputs))
+
+    def run_iter(self, *single_input_args, **single_or_multi_input_kwargs) -> Iterator[Any]:
+        """
+        Same as 'run', but yields results one by one instead of building a list.
+        Pipeline is executed when the first result is requested.
+
+        Yields:
+            Any: The evaluated results of the output tasks.
+        """
+        stopped_task = self._execute(single_input_args, single_or_multi_input_kwargs)
+        if stopped_task is not None:
+            yield stopped_task.evaluated_result
+            yield stopped_task.to_stopping_holder()
+            return
+        for output in self.outputs:
+            yield output.evaluated_result
+
+    def _execute(self, single_input_args, single_or_multi_input_kwargs) -> Task | None:
+        """Run all tasks in order. Return task which triggered conditional stop, if any."""
         self._setup_input(single_input_args, single_or_multi_input_kwargs)
+        stop_by_id = self._stop_by_id
+        if not stop_by_id and not self._cached_ids:
+            self._get_compiled_run()()
+            return None
         for task in self.tasks:
-            task.run()
-            if self.conditional_stops:
-                if task.name in self.conditional_stops:
-                    if self.conditional_stops[task.name](task.evaluated_result):
-                        return [task.evaluated_result, (task.to_stopping_holder())]
-        return [output.evaluated_result for output in self.outputs]
-
-    def _setup_input(self, single_input_args, single_or_multi_input_kwargs):
-        if self._have_multi_input:
-            self._update_args_for_multi_input(single_or_multi_input_kwargs)
+            self._run_task(task)
+            stop = stop_by_id.get(id(task))
+            if stop is not None and stop(task.evaluated_result):
+                return task
+        return None
+
+    def _get_compiled_run(self) -> Callable[[], None]:
+        """
+        Function executing all tasks in order, generated by '_compile'.
+        It is generated again if arguments of any task it calls directly
+        were updated since generation, as they are embedded in its code.
+        """
+        if self._compiled is None or any(
+            task._args_version != version for task, version in self._compiled[1]
+        ):
+            self._compiled = self._compile()
+        return self._compiled[0]
+
+    def _compile(self) -> tuple[Callable[[], None], list[tuple[Task, int]]]:
+        """
+        Generate a function that executes all tasks one after another
+        with direct calls, skipping the generic 'Task.run' machinery.
+
+        Results of tasks are kept in local variables and passed straight
+        to tasks that use them. Remaining arguments are read from tasks
+        at call time, but which of them are tasks, and keys of kwargs,
+        are fixed in generated code.
+        Input tasks, all references to tasks behind inputs, and tasks
+        with overridden 'run' are executed with 'run', as inputs
+        arguments are updated on every execution.
+
+        Returns:
+            tuple: Function that runs the pipeline tasks, and pairs of tasks
+                called directly with their arguments versions at generation time.
+        """
+        namespace = dict()
+        lines = ["def _compiled_run():"]
+        result_vars = dict()
+        versions = []
+        input_source_ids = {id(_source_task(input_)) for input_ in self.inputs}
+        for i, task in enumerate(self.tasks):
+            task_var, result_var = f"_t{i}", f"r{i}"
+            namespace[task_var] = task
+            if (
+                id(_source_task(task)) in input_source_ids
+                or type(task).run not in _COMPILABLE_RUNS
+                or _source_task(task).cacheable
+            ):
+                lines.append(f"    {task_var}.run()")
+                lines.append(f"    {result_var} = {task_var}.evaluated_result")
+                if isinstance(task, TaskReference) and id(task.task) not in result_vars:
+                    # Sibling references reuse result of the source task evaluated by 'run'.
+                    lines.append(f"    s{i} = {task_var}.task.evaluated_result")
+                    result_vars[id(task.task)] = f"s{i}"
+            elif isinstance(task, TaskReference):
+                source_var = result_vars.get(id(task.task))
+                if source_var is None:
+                    source_var = f"s{i}"
+                    namespace[f"_s{i}"] = task.task
+                    call = _call_source(task.task, f"_s{i}", result_vars)
+                    lines.append(f"    {source_var} = _s{i}.evaluated_result = {call}")
+                    result_vars[id(task.task)] = source_var
+                    versions.append((task.task, task.task._args_version))
+                lines.append(
+                    f"    {result_var} = {task_var}.evaluated_result = {source_var}[{task.ref_index}]")
+            else:
+                call = _call_source(task, task_var, result_vars)
+                lines.append(f"    {result_var} = {task_var}.evaluated_result = {call}")
+                versions.append((task, task._args_version))
+            result_vars[id(task)] = result_var
+        code = compile("\n".join(lines), f"<dagpipe {self!r}>", "exec")
+        exec(code, namespace)
+        return namespace["_compiled_run"], versions
+
+    def run_parallel(self,
+                     *single_input_args,
+                     max_workers: int | None = None,
+                     executor: Executor | None = None,
+                     **single_or_multi_input_kwargs) -> list[Task]:
+        """
+        Execute the pipeline like 'run', but evaluate independent tasks concurrently.
+
+        Every task is submitted to a thread pool as soon as all of its
+        parents are finished. Conditional stops are checked after each
+        finished task.
+        Functions wrapped by tasks must be thread safe, and gain from it
+        only if they release the GIL (I/O, numpy, subprocesses etc.).
+
+        Args:
+            *single_input_args: Same as in 'run'.
+            max_workers (int, optional): Maximum number of threads,
+                passed to ThreadPoolExecutor.
+            executor (Executor, optional): Thread based executor reused
+                instead of creating a new pool for every call.
+                It is not shut down after execution. If passed,
+                max_workers is ignored.
+            **single_or_multi_input_kwargs: Same as in 'run'.
+
+        Returns:
+            list: The evaluated results of the output tasks.
+        """
+        self._setup_input(single_input_args, single_or_multi_input_kwargs)
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return self.__run_scheduled(executor)
+        return self.__run_scheduled(executor)
+
+    def __run_scheduled(self, executor: Executor) -> list:
+        """
+        Submit tasks to executor as soon as their parents are finished.
+        On conditional stop or task error, jobs that are already running
+        are waited for, so they can't overlap with the next execution.
+        """
+        stop_by_id = self._stop_by_id
+        tasks = self.tasks
+        parents, children = self._adjacency
+        pending_parents = [len(task_parents) for task_parents in parents]
+        ready = [i for i, count in enumerate(pending_parents) if count == 0]
+        running = dict()
+        try:
+            while ready or running:
+                for job in self.__group_by_source_task(tasks, ready):
+                    running[executor.submit(self.__run_tasks, [tasks[i] for i in job])] = job
+                ready = []
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    future.result()
+                    for i in job:
+                        task = tasks[i]
+                        stop = stop_by_id.get(id(task))
+                        if stop is not None and stop(task.evaluated_result):
+                            return [task.evaluated_result, (task.to_stopping_holder())]
+                        for child in children[i]:
+                            pending_parents[child] -= 1
+                            if pending_parents[child] == 0:
+                                ready.append(child)
+        finally:
+            for pending in running:
+                pending.cancel()
+            wait(running)
+        return list(map(_evaluated_result, self.outputs))
+
+    @functools.cached_property
+    def _adjacency(self) -> tuple[list[list[int]], list[list[int]]]:
+        """
+        Positions of parents and children of every task,
+        indexed by task position in self.tasks.
+        """
+        positions = {id(task): i for i, task in enumerate(self.tasks)}
+        parents = [[positions[id(p)] for p in task.parent_tasks] for task in self.tasks]
+        children = [[] for _ in self.tasks]
+        for i, task_parents in enumerate(parents):
+            for parent in task_parents:
+                children[parent].append(i)
+        return parents, children
+
+    @staticmethod
+    def __group_by_source_task(tasks: list[Task], positions: list[int]) -> list[list[int]]:
+        """References to one task share its execution, so they must run in one job."""
+        groups = dict()
+        for i in positions:
+            source_task = _source_task(tasks[i])
+            groups.setdefault(id(source_task), []).append(i)
+        return list(groups.values())
+
+    def __run_tasks(self, tasks: list[Task]):
+        for task in tasks:
+            self._run_task(task)
+
+    def _run_task(self, task: Task):
+        if id(task) in self._cached_ids:
+            self._run_cached(task)
         else:
-            self.inputs[0].update_args_if_provided(
-                *single_input_args, **single_or_multi_input_kwargs)
+            task.run()
+
+    def _run_cached(self, task: Task):
+        """Run task, or restore its result if it was already
+        evaluated with the same arguments.
+        References share results cache of the task they point to,
+        and up to 128 recently used results are kept for every task."""
+        source_task = _source_task(task)
+        results_cache = self._results_cache.get(id(source_task))
+        if results_cache is None:
+            results_cache = self._results_cache[id(source_task)] = ResultsCache()
+        source_task.evaluated_result = evaluate_memoized(
+            results_cache, source_task.evaluate_result, *source_task.unpack_args_from_results())
+        if source_task is not task:
+            task.evaluated_result = source_task.evaluated_result[task.ref_index]
+
+    def _setup_single_input(self, single_input_args, single_input_kwargs):
+        self.inputs[0].update_args_if_provided(*single_input_args, **single_input_kwargs)
+
+    def _setup_multi_input(self, _, multi_input_kwargs):
+        self._update_args_for_multi_input(multi_input_kwargs)
 
     def _update_args_for_multi_input(self, single_or_multi_input_kwargs: dict):
         for task_name, arg_or_kwarg in single_or_multi_input_kwargs.items():
             task = self[task_name]
-            if not task in self.inputs:
+            if id(task) not in self._input_ids:
                 raise ValueError(f"{task} is not in inputs.")
             args, kwargs = self._parse_args_or_kwargs(arg_or_kwarg)
             task.update_args_if_provided(*args, **kwargs)
 
     @staticmethod
     def _parse_args_or_kwargs(arg_or_kwarg: Any | tuple | dict):
-        if isinstance(arg_or_kwarg, tuple):
-            if (
-                (len(arg_or_kwarg) == 2) 
-                and isinstance(arg_or_kwarg[0], tuple)
-                and isinstance(arg_or_kwarg[1], dict)
-            ):
-                args_, kwargs_ = arg_or_kwarg
+        parser = _PARSERS.get(type(arg_or_kwarg))
+        if parser is None:
+            if isinstance(arg_or_kwarg, tuple):
+                parser = _parse_tuple
+            elif isinstance(arg_or_kwarg, dict):
+                parser = _parse_dict
             else:
-                args_, kwargs_ = arg_or_kwarg, {}
-        elif isinstance(arg_or_kwarg, dict):
-            args_, kwargs_ = tuple(), arg_or_kwarg
-        else:
-            args_, kwargs_ = (arg_or_kwarg, ), {}
-        return args_, kwargs_
+                parser = _parse_scalar
+        return parser(arg_or_kwarg)
     
     def with_outputs(self, outputs_names: str | list[str]):
         """Create new pipeline with inputs and conditional stops from self.
@@ -222,8 +606,32 @@ class Pipeline:
         """
         outputs_names = self._uniform_to_list(outputs_names, str)
         outputs = [self[name] for name in outputs_names]
-        
-        return Pipeline(self.inputs, outputs, self.conditional_stops)
+        pipeline = self._from_validated(self.inputs, outputs, self.conditional_stops, self.cache)
+        kept_tasks = self._ancestors_in_order(outputs)
+        if kept_tasks is not None:
+            pipeline.__assert_all_inputs_seen({id(task) for task in kept_tasks})
+            pipeline.tasks = kept_tasks
+        return pipeline
+
+    def _ancestors_in_order(self, outputs: list[Task]) -> list[Task] | None:
+        """Select ancestors of outputs from already ordered self.tasks.
+
+        Returns:
+            list[Task] | None: Ancestors in execution order,
+                or None if some output is not one of self.tasks.
+        """
+        positions = {id(task): i for i, task in enumerate(self.tasks)}
+        if not all(id(output) in positions for output in outputs):
+            return None
+        kept = set()
+        queue = deque(outputs)
+        while queue:
+            current_task = queue.popleft()
+            if id(current_task) in kept:
+                continue
+            kept.add(id(current_task))
+            queue.extend(current_task.parent_tasks)
+        return [task for task in self.tasks if id(task) in kept]
 
     def __repr__(self) -> str:
         return f"Pipeline(in: {self.inputs}, out: {self.outputs})"
@@ -7,9 +7,11 @@ Classes:
     MethodTask: Similar to task, but works with class methods.
 """
 
+from itertools import chain
+from types import MethodType
 from typing import Any, Iterable
 
-from dagpipe.utils import uniform_args_kwargs_order
+from dagpipe.utils import ResultsCache, evaluate_memoized, uniform_args_kwargs_order
 
 
 class Task:
@@ -26,9 +28,18 @@ class Task:
         name (str): The name of the task.
         outputs_num (int): The number of outputs the function returns.
         references (list): List of TaskReference objects.
+        cacheable (bool): Whether results are memoized by evaluated arguments.
+        parent_tasks (tuple): Tasks passed as args or kwargs.
 
     """
-    def __init__(self, func, *args, name="auto", outputs_num=1, **kwargs):
+    __slots__ = (
+        "func", "args", "kwargs", "outputs_num", "name", "evaluated_result",
+        "references", "ran_refs", "cacheable", "_cache",
+        "_parent_tasks", "_task_args_slots", "_args_buffer", "_kwargs_buffer",
+        "_args_version",
+    )
+
+    def __init__(self, func, *args, name="auto", outputs_num=1, cacheable=False, **kwargs):
         """
         Initialize a Task instance.
 
@@ -36,22 +47,61 @@ class Task:
             func (callable): The function to be executed.
             name (str, optional): Name that would be displayed in visualization.
             outputs_num (int, optional): Number of of outputs, function returns.
+            cacheable (bool, optional): If True, results are memoized by
+                evaluated arguments and function is not called again
+                for the same arguments. Up to 128 recently used results
+                are kept, calls with unhashable arguments are not memoized.
+                Use only for pure functions.
             *args: Positional arguments to be passed to the function.
             **kwargs: Keyword arguments to be passed to the function.
         """
         self.func = func
-        args, kwargs = uniform_args_kwargs_order(func, args, kwargs)
+        if args or kwargs:
+            args, kwargs = uniform_args_kwargs_order(func, args, kwargs)
         self.args = args
         self.kwargs = kwargs
         self.outputs_num=outputs_num
         self.name = name if name != "auto" else self._get_function_name()
         self.evaluated_result = None
         self.references = None
-        self._index = 0
+        self.ran_refs = 0
+        self.cacheable = cacheable
+        self._cache = None
+        self._parent_tasks = None
+        self._task_args_slots = None
+        self._args_version = 0
 
     def _get_function_name(self):
         return self.func.__name__
 
+    @property
+    def parent_tasks(self) -> tuple["Task", ...]:
+        """
+        Tasks passed to this task as positional or keyword arguments.
+        Computed on first access and cached until arguments are updated.
+        """
+        if self._parent_tasks is None:
+            self._parent_tasks = tuple(
+                arg for arg in chain(self.args, self.kwargs.values())
+                if isinstance(arg, Task)
+            )
+        return self._parent_tasks
+
+    def _get_task_args_slots(self) -> tuple[tuple[int, ...], tuple[str, ...]]:
+        """
+        Positions of args and keys of kwargs that hold Task instances.
+        Computed on first access and cached until arguments are updated,
+        together with buffers that unpacked arguments are written to.
+        """
+        if self._task_args_slots is None:
+            self._task_args_slots = (
+                tuple(i for i, a in enumerate(self.args) if isinstance(a, Task)),
+                tuple(k for k, v in self.kwargs.items() if isinstance(v, Task)),
+            )
+            self._args_buffer = list(self.args)
+            self._kwargs_buffer = self.kwargs.copy()
+        return self._task_args_slots
+
     def run(self, *args, **kwargs) -> Any:
         """
         Execute the task with provided arguments and update the evaluated result.
@@ -65,9 +115,21 @@ class Task:
         """
         self.update_args_if_provided(*args, **kwargs)
         args, kwargs = self.unpack_args_from_results()
-        self.evaluated_result = self.evaluate_result(*args, **kwargs)
+        if self.cacheable:
+            self.evaluated_result = self._evaluate_cached_result(args, kwargs)
+        else:
+            self.evaluated_result = self.evaluate_result(*args, **kwargs)
         return self.evaluated_result
 
+    def _evaluate_cached_result(self, args: tuple, kwargs: dict) -> Any:
+        """
+        Return memoized result for given arguments, evaluating it on first call.
+        Results for unhashable arguments are not memoized.
+        """
+        if self._cache is None:
+            self._cache = ResultsCache()
+        return evaluate_memoized(self._cache, self.evaluate_result, args, kwargs)
+
     def evaluate_result(self, *args, **kwargs) -> Any:
         """
         Evaluate the result by executing the function with given arguments.
@@ -82,54 +144,76 @@ class Task:
             *args: Replace currently stored args starting from args beginning.
             **kwargs: Only update existing kwargs.
         """
+        if not args and not kwargs:
+            return
         args, kwargs = uniform_args_kwargs_order(self.func, args, kwargs)
         if args:
-            self.args = tuple([*args, *self.args[len(args):]])
+            self.args = args + self.args[len(args):]
         if kwargs:
             self.kwargs.update(kwargs)
+        if args or kwargs:
+            self._parent_tasks = None
+            self._task_args_slots = None
+            self._args_version += 1
 
     def unpack_args_from_results(self) -> tuple[tuple, dict]:
         """
         Process self.args and self.kwargs in a way that results
         are encapsulated from Task type values, and rest remains unchanged.
+        Returned dict is reused between calls, so it should not be modified.
 
         Returns:
             Tuple[Tuple, Dict]: The unpacked positional and keyword arguments.
         """
-        args = tuple(a if not isinstance(a, Task) else a.evaluated_result for a in self.args)
-        kwargs = {k: v if not isinstance(v, Task) else v.evaluated_result for k, v in self.kwargs.items()}
+        task_args_positions, task_kwargs_keys = self._get_task_args_slots()
+        args = self.args
+        if task_args_positions:
+            buffer = self._args_buffer
+            for i in task_args_positions:
+                buffer[i] = args[i].evaluated_result
+            args = tuple(buffer)
+        kwargs = self.kwargs
+        if task_kwargs_keys:
+            buffer = self._kwargs_buffer
+            for k in task_kwargs_keys:
+                buffer[k] = kwargs[k].evaluated_result
+            kwargs = buffer
         return args, kwargs
 
     def __iter__(self):
         """
-        Initialize an iterator for the task's outputs.
+        Iterate over references to the task's outputs.
+
+        Yields:
+            TaskReference: References for consecutive outputs.
         """
-        if self.references is None:
-            self.references = []
-            for index in range(self.outputs_num):
-                ref_name = f"{self.name}[{index}]"
-                self.references.append(TaskReference(self, index, ref_name))
-        elif len(self.references) < self.outputs_num:
-            for index in range(len(self.references), self.outputs_num):
-                ref_name = f"{self.name}[{index}]"
-                self.references.append(TaskReference(self, index, ref_name))
-        self._index = 0
-        return self
+        for index in range(self.outputs_num):
+            yield self[index]
 
-    def __next__(self):
+    def __getitem__(self, index: int) -> "TaskReference":
         """
-        Get the next output reference in the iteration.
+        Get reference to the output with given index.
+        References are created on first access and reused afterwards.
+
+        Args:
+            index (int): Index of the output.
 
         Returns:
-            TaskReference: The next TaskReference object.
+            TaskReference: Reference to the output.
 
         Raises:
-            StopIteration: If there are no more outputs to iterate over.
+            IndexError: If index is not lower than number of outputs.
         """
-        if self._index == self.outputs_num:
-            raise StopIteration
-        self._index += 1
-        return self.references[self._index-1]
+        if not 0 <= index < self.outputs_num:
+            raise IndexError(f"{self} has {self.outputs_num} outputs, got index {index}.")
+        if self.references is None:
+            self.references = [None] * self.outputs_num
+        elif len(self.references) < self.outputs_num:
+            self.references.extend([None] * (self.outputs_num - len(self.references)))
+        if self.references[index] is None:
+            ref_name = f"{self.name}[{index}]"
+            self.references[index] = TaskReference(self, index, ref_name)
+        return self.references[index]
 
     def set_name(self, name: str | Iterable):
         """
@@ -181,8 +265,9 @@ class MethodTask(Task):
     Attributes:
         instance (Any): The instance on which the method will be executed.
     """
+    __slots__ = ("instance", "_bound_method")
 
-    def __init__(self, instance, func, *args, name="auto", outputs_num=1, **kwargs):
+    def __init__(self, instance, func, *args, name="auto", outputs_num=1, cacheable=False, **kwargs):
         """
         Initialize a MethodTask instance.
 
@@ -191,17 +276,22 @@ class MethodTask(Task):
             func (callable): The method to be executed.
             name (str, optional): Name that would be displayed in visualization.
             outputs_num (int, optional): Number of of outputs, function returns.
+            cacheable (bool, optional): If True, results are memoized by
+                evaluated arguments. Use only for pure methods.
             *args: Positional arguments to be passed to the method.
             **kwargs: Keyword arguments to be passed to the method.
         """
         self.instance = instance
-        super().__init__(func, *args, name=name, outputs_num=outputs_num, **kwargs)
-        
+        super().__init__(
+            func, *args, name=name, outputs_num=outputs_num, cacheable=cacheable, **kwargs)
+        # Works for any callable, which gets instance as the first argument.
+        self._bound_method = MethodType(func, instance)
+
     def evaluate_result(self, *args, **kwargs) -> Any:
         """
         Evaluate the result by executing the method with given arguments.
         """
-        return self.func(self.instance, *args, **kwargs)
+        return self._bound_method(*args, **kwargs)
 
     def __repr__(self) -> str:
         """
@@ -227,6 +317,8 @@ class TaskReference(Task):
         task (Task): The original task this reference points to.
         ref_index (int): The index of the output this reference points to.
     """
+    __slots__ = ("task", "ref_index")
+
     def __init__(self, task: Task, ref_index: int, name: str):
         """
         Initialize a TaskReference instance.
@@ -236,9 +328,29 @@ class TaskReference(Task):
             ref_index (int): The index of the output this reference points to.
             name (str): The name of the reference.
         """
-        super().__init__(task.func, *task.args, name=name, outputs_num=1, **task.kwargs)
+        super().__init__(task.func, name=name, outputs_num=1)
         self.task = task
         self.ref_index = ref_index
+        self.args = task.args
+        self.kwargs = task.kwargs
+
+    @property
+    def parent_tasks(self) -> tuple[Task, ...]:
+        """
+        Tasks passed as arguments to the referenced task.
+        """
+        return self.task.parent_tasks
+
+    def update_args_if_provided(self, *args, **kwargs) -> None:
+        """
+        Update arguments of the referenced task, that are shared with the reference.
+
+        Args:
+            *args: Replace currently stored args starting from args beginning.
+            **kwargs: Only update existing kwargs.
+        """
+        self.task.update_args_if_provided(*args, **kwargs)
+        self.args = self.task.args
 
     def run(self, *args, **kwargs) -> Any:
         """
@@ -251,8 +363,9 @@ class TaskReference(Task):
         Returns:
             Any: The result of the function execution.
         """
-        if self._all_refs_ran() or (not self.task.evaluated_result):
+        if self._all_refs_ran() or (self.task.evaluated_result is None):
             self.task.run(*args, **kwargs)
+            self.args = self.task.args
         self.evaluated_result = self.task.evaluated_result[self.ref_index]
         return self.evaluated_result
 
@@ -263,14 +376,13 @@ class TaskReference(Task):
         Returns:
             bool: True if all references have run, False otherwise.
         """
-        if not hasattr(self.task, "ran_refs"):
-            self.task.ran_refs = [self]
-            return True
-        if self in self.task.ran_refs:
-            self.task.ran_refs = [self]
+        ref_bit = 1 << self.ref_index
+        ran_refs = self.task.ran_refs
+        if not ran_refs or ran_refs & ref_bit:
+            self.task.ran_refs = ref_bit
             return True
         else:
-            self.task.ran_refs.append(self)
+            self.task.ran_refs = ran_refs | ref_bit
             return False
 
     def __repr__(self) -> str:
@@ -287,6 +399,8 @@ class StoppingTaskHolder:
     Attributes:
         task (Task): The task that is being held and marked as stopped.
     """
+    __slots__ = ("task",)
+
     def __init__(self, task: Task):
         """
         Initialize a StoppingTaskHolder instance.
@@ -297,8 +411,9 @@ class StoppingTaskHolder:
         self.task = task
     
     @classmethod
-    def in_(self, collection: Iterable):
-        return any([isinstance(elem, StoppingTaskHolder) for elem in collection])
+    def in_(cls, collection: Iterable):
+        """Check if any element of collection is a StoppingTaskHolder."""
+        return any(isinstance(elem, cls) for elem in collection)
 
     def __repr__(self) -> str:
         return "STOPPED AT " + self.task.__repr__()
@@ -8,14 +8,17 @@ Functions:
     method_task(method): A decorator that wraps a method in a MethodTask instance.
 """
 
-import functools
-import inspect
 from typing import Any, Callable
 
 from dagpipe.task_core import Task, MethodTask
+from dagpipe.utils import get_param_layout
 
 
-def task(name="auto", outputs_num: int = 1) -> Callable[[Callable], Callable[[Any], Task]]:
+def task(
+        name="auto",
+        outputs_num: int = 1,
+        cacheable: bool = False,
+    ) -> Callable[[Callable], Callable[[Any], Task]]:
     """
     A decorator that wraps a function in a Task instance.
     Task postpone function execution, 
@@ -24,31 +27,44 @@ def task(name="auto", outputs_num: int = 1) -> Callable[[Callable], Callable[[An
     Args:
         name (str, optional): Name used in visualization.
         outputs_num (int, optional): Number of of outputs, function returns. 
+        cacheable (bool, optional): Memoize results by evaluated arguments.
+            Use only for pure functions.
 
     Returns:
         callable: A wrapped function that returns a Task instance.
     """
     def decorator(func):
+        get_param_layout(func)
         # @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Task:
-            return Task(func, *args, name=name, outputs_num=outputs_num, **kwargs)
+            return Task(
+                func, *args, name=name, outputs_num=outputs_num, cacheable=cacheable, **kwargs)
         return wrapper
     return decorator
 
 
-def method_task(name="auto", outputs_num=1) -> Callable[[Callable], Callable[[Any], MethodTask]]:
+def method_task(
+        name="auto",
+        outputs_num=1,
+        cacheable: bool = False,
+    ) -> Callable[[Callable], Callable[[Any], MethodTask]]:
     """
     Similar to 'task' but works with class method instead of standalone functions. 
 
     Args:
         name (str, optional): Name used in visualization.
         outputs_num (int, optional): Number of of outputs, function returns.
+        cacheable (bool, optional): Memoize results by evaluated arguments.
+            Use only for pure methods.
     Returns:
         callable: A wrapped method that returns a MethodTask instance.
     """
     def decorator(method):
+        get_param_layout(method)
         # @functools.wraps(method)
         def wrapper(instance, *args, **kwargs) -> Task:
-            return MethodTask(instance, method, *args, name=name, outputs_num=outputs_num, **kwargs)
+            return MethodTask(
+                instance, method, *args,
+                name=name, outputs_num=outputs_num, cacheable=cacheable, **kwargs)
         return wrapper
     return decorator
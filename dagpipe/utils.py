@@ -1,4 +1,6 @@
 import inspect
+import weakref
+from collections import namedtuple
 
 
 class ArgumentError(Exception):
@@ -7,16 +9,127 @@ class ArgumentError(Exception):
 
 class EmptyInputError(Exception):
     """Custom exception for empty input errors."""
-    
 
-import inspect
-from collections import namedtuple
 
-class ArgumentError(Exception):
-    pass
+ParamLayout = namedtuple(
+    "ParamLayout", ["params", "varargs_name", "varkwargs_name", "plain_arity"])
+ParamLayout.__doc__ = """
+Parameters of a function in a form that is cheap to iterate over.
+
+Attributes:
+    params (tuple): Tuples (name, kind, has_default) for every parameter.
+    varargs_name (str | None): Name of *args parameter, if present.
+    varkwargs_name (str | None): Name of **kwargs parameter, if present.
+    plain_arity (int | None): Number of parameters if all of them can be
+        passed positionally and there is no *args nor **kwargs, else None.
+"""
+
+_layouts = weakref.WeakKeyDictionary()
+
+_POSITIONAL_KINDS = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+_VAR_POSITIONAL = inspect.Parameter.VAR_POSITIONAL
+_KEYWORD_ONLY = inspect.Parameter.KEYWORD_ONLY
+_VAR_KEYWORD = inspect.Parameter.VAR_KEYWORD
+
+
+def get_param_layout(func) -> ParamLayout:
+    """
+    Return parameters layout of the given function.
+    Layouts are cached for as long as the function exists,
+    callables that can't be weakly referenced are inspected on each call.
+    """
+    try:
+        return _layouts[func]
+    except (KeyError, TypeError):
+        pass
+    if not callable(func):
+        raise TypeError(f"Expected callable, got {type(func).__name__}.")
+    sig = getattr(func, "__signature__", None)
+    if not isinstance(sig, inspect.Signature):
+        sig = inspect.signature(func)
+    layout = _build_param_layout(sig)
+    try:
+        _layouts[func] = layout
+    except TypeError:
+        pass
+    return layout
+
+
+def _build_param_layout(sig: inspect.Signature) -> ParamLayout:
+    params = []
+    varargs_name = varkwargs_name = None
+    for name, param in sig.parameters.items():
+        params.append((name, param.kind, param.default is not inspect.Parameter.empty))
+        if param.kind == _VAR_POSITIONAL:
+            varargs_name = name
+        elif param.kind == _VAR_KEYWORD:
+            varkwargs_name = name
+    if all(kind in _POSITIONAL_KINDS for _, kind, _ in params):
+        plain_arity = len(params)
+    else:
+        plain_arity = None
+    return ParamLayout(tuple(params), varargs_name, varkwargs_name, plain_arity)
+
+
+def args_cache_key(args: tuple, kwargs: dict) -> tuple | None:
+    """
+    Build a memoization key from evaluated arguments.
+    Returns None when arguments are not hashable, and results should not be memoized,
+    since such arguments can be modified in place, and ids of freed objects are reused.
+    """
+    key = (args, tuple(kwargs.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class ResultsCache:
+    """
+    Memoized results, limited to maxsize least recently used entries.
+
+    Attributes:
+        maxsize (int): Maximum number of stored results.
+    """
+    __slots__ = ("maxsize", "_results")
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._results = dict()
+
+    def __contains__(self, key) -> bool:
+        return key in self._results
+
+    def __getitem__(self, key):
+        # Reinsert to mark entry as most recently used.
+        result = self._results[key] = self._results.pop(key)
+        return result
+
+    def __setitem__(self, key, result):
+        self._results.pop(key, None)
+        if len(self._results) >= self.maxsize:
+            del self._results[next(iter(self._results))]
+        self._results[key] = result
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+def evaluate_memoized(results_cache: ResultsCache, evaluate, args: tuple, kwargs: dict):
+    """
+    Return result memoized in results_cache for given evaluated arguments,
+    calling evaluate(*args, **kwargs) and storing its result on a miss.
+    Calls with unhashable arguments are evaluated and not stored.
+    """
+    key = args_cache_key(args, kwargs)
+    if key is None:
+        return evaluate(*args, **kwargs)
+    if key in results_cache:
+        return results_cache[key]
+    result = results_cache[key] = evaluate(*args, **kwargs)
+    return result
 
-class EmptyInputError(Exception):
-    pass
 
 def uniform_args_kwargs_order(func, input_args, input_kwargs, allow_empty_input=True):
     """
@@ -36,9 +149,17 @@ def uniform_args_kwargs_order(func, input_args, input_kwargs, allow_empty_input=
         ArgumentError: If an argument is passed both as a positional and a keyword argument.
         EmptyInputError: If allow_empty_input is False and inspect._empty objects are encountered.
     """
-    # Get the signature of the function
-    sig = inspect.signature(func)
-    params = sig.parameters
+    # Get the parameters of the function
+    layout = get_param_layout(func)
+
+    # Fast path: positional arguments only, passed to function without *args, **kwargs
+    # and keyword-only parameters, are already in signature order.
+    arity = layout.plain_arity
+    if arity is not None and not input_kwargs and (allow_empty_input or len(input_args) >= arity):
+        return tuple(input_args[:arity]), {}
+    # Fast path: function takes only *args, so all positional arguments go there.
+    if layout.varargs_name is not None and len(layout.params) == 1 and not input_kwargs:
+        return tuple(input_args), {}
     
     output_args = []
     output_kwargs = {}
@@ -49,8 +170,8 @@ def uniform_args_kwargs_order(func, input_args, input_kwargs, allow_empty_input=
     # Track which parameters have been used to detect duplicates
     used_params = set()
     
-    for param_name, param in params.items():
-        if param.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD):
+    for param_name, kind, has_default in layout.params:
+        if kind in _POSITIONAL_KINDS:
             if arg_index < len(input_args):
                 if param_name in input_kwargs:
                     raise ArgumentError(f"Argument '{param_name}' is passed both as a positional and a keyword argument.")
@@ -60,24 +181,24 @@ def uniform_args_kwargs_order(func, input_args, input_kwargs, allow_empty_input=
             elif param_name in input_kwargs:
                 output_args.append(input_kwargs.pop(param_name))
                 used_params.add(param_name)
-            elif param.default is not inspect.Parameter.empty:
+            elif has_default:
                 if not allow_empty_input:
                     raise EmptyInputError(f"Argument '{param_name}' is required but not provided.")
             elif not allow_empty_input:
                 raise EmptyInputError(f"Argument '{param_name}' is required but not provided.")
-        elif param.kind == inspect.Parameter.VAR_POSITIONAL:
+        elif kind == _VAR_POSITIONAL:
             output_args.extend(input_args[arg_index:])
             arg_index = len(input_args)
-        elif param.kind == inspect.Parameter.KEYWORD_ONLY:
+        elif kind == _KEYWORD_ONLY:
             if param_name in input_kwargs:
                 output_kwargs[param_name] = input_kwargs.pop(param_name)
                 used_params.add(param_name)
-            elif param.default is not inspect.Parameter.empty:
+            elif has_default:
                 if not allow_empty_input:
                     raise EmptyInputError(f"Keyword argument '{param_name}' is required but not provided.")
             elif not allow_empty_input:
                 raise EmptyInputError(f"Keyword argument '{param_name}' is required but not provided.")
-        elif param.kind == inspect.Parameter.VAR_KEYWORD:
+        elif kind == _VAR_KEYWORD:
             output_kwargs.update(input_kwargs)
             input_kwargs = {}
     
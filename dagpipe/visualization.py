@@ -4,86 +4,197 @@ This module provides functionality to visualize a pipeline of tasks using graphv
 Functions:
     visualize(pipeline, to_file=None): Display a pipeline of tasks 
                                        or save its visualization to a file.
+    visualize_many(pipelines, to_files): Save visualizations of many pipelines
+                                         to files concurrently.
 """
 
-__all__ = ["visualize"]
+__all__ = ["visualize", "visualize_many"]
 
 
-import os
-import tempfile
-import graphviz
-from matplotlib import pyplot as plt
+import functools
+import io
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
 
 from dagpipe.task_core import Task, TaskReference
 from dagpipe.pipeline import Pipeline
 
+_MISSING_DEPENDENCY_MESSAGE = (
+    "There is no graphviz or matplotlib library in your "
+    "environment, so visualize method could not be used. "
+    "If you want to use this package install this package with "
+    "pip install dagpipe[viz].")
 
-def visualize(pipeline: Pipeline, to_file: str | None = None):
+_graphs = weakref.WeakKeyDictionary()
+
+
+def visualize(pipeline: Pipeline, to_file: str | None = None, fast: bool = False):
     """
     Visualize a pipeline of tasks using graphviz or save it to a file.
-    Displayed image is generated by matplotlib.
+    Displayed image is rendered in memory and shown by matplotlib.
+    Rendered images are cached, so unchanged pipelines are not laid out again.
+    Both libraries are imported on first use, matplotlib only if image is displayed.
 
     Args:
         pipeline (Pipeline): The pipeline to be visualized.
         to_file (str, optional): The file path to save the visualization. 
                                  If None, the visualization is displayed.
+        fast (bool, optional): Use straight edges and limit layout iterations,
+                               which speeds up rendering of large pipelines.
+
+    Raises:
+        ImportError: If graphviz or matplotlib is not installed.
     """
-    graph = _build_graph(pipeline)
+    graph = _build_graph(pipeline, fast)
     if to_file:
-        graph.render(to_file, format='png', view=False)
+        _save_png(graph, to_file)
     else:
-        with tempfile.TemporaryDirectory() as tempdir:
-            file_path = os.path.join(tempdir, 'graph')
-            graph.render(file_path, format='png', view=False)
-            img = plt.imread(file_path + ".png")
-            plt.imshow(img)
-            plt.axis("off")
-
-def _build_graph(pipeline : Pipeline):
+        try:
+            from matplotlib import pyplot as plt
+            from PIL import Image
+        except ImportError as error:
+            raise ImportError(_MISSING_DEPENDENCY_MESSAGE) from error
+        img = Image.open(io.BytesIO(_render_png(graph.source)))
+        plt.imshow(img)
+        plt.axis("off")
+
+def visualize_many(
+        pipelines: Iterable[Pipeline],
+        to_files: Iterable[str],
+        max_workers: int | None = None,
+        fast: bool = False):
     """
-    Execute the pipeline of tasks with optional initial arguments.
+    Save visualizations of many pipelines to files.
+    Graphviz layout runs in a separate process for each file,
+    so files are rendered concurrently.
 
     Args:
-        *args: Positional arguments to be passed to the initial task.
-        **kwargs: Keyword arguments to be passed to the initial task.
+        pipelines (Iterable[Pipeline]): The pipelines to be visualized.
+        to_files (Iterable[str]): File paths, one for each pipeline.
+        max_workers (int, optional): Maximum number of concurrent renders,
+                                     passed to ThreadPoolExecutor.
+        fast (bool, optional): Same as in 'visualize'.
+
+    Raises:
+        ImportError: If graphviz is not installed.
+        ValueError: If number of pipelines and files differ.
+    """
+    pipelines = list(pipelines)
+    to_files = list(to_files)
+    if len(pipelines) != len(to_files):
+        raise ValueError(
+            f"Got {len(pipelines)} pipelines, but {len(to_files)} files to save them.")
+    graphs = [_build_graph(pipeline, fast) for pipeline in pipelines]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_save_png, graph, to_file)
+            for graph, to_file in zip(graphs, to_files)
+        ]
+        for future in futures:
+            future.result()
+
+
+def _save_png(graph, to_file: str):
+    """
+    Save graph source to to_file and its image to to_file + '.png',
+    same files as graph.render(to_file, format='png') creates.
+    """
+    graph.save(to_file)
+    with open(f"{to_file}.png", "wb") as file:
+        file.write(_render_png(graph.source))
+
+
+@functools.lru_cache(maxsize=32)
+def _render_png(source: str) -> bytes:
+    """
+    Render DOT source to PNG, reusing the image of identical sources.
+    """
+    import graphviz
+    return graphviz.Source(source).pipe(format='png')
+
+
+def _build_graph(pipeline : Pipeline, fast: bool = False):
+    """
+    Build graphviz graph of the pipeline.
+    Graph is cached per pipeline and rebuilt only if tasks, their names,
+    connections or conditional stops changed since the last call.
+    Nodes are added in topological order of pipeline.tasks (inputs first),
+    which dot ranks with fewer iterations than an arbitrary order.
+
+    Args:
+        pipeline (Pipeline): The pipeline to be visualized.
+        fast (bool, optional): Use dot layout attributes that trade edge
+                               routing quality for layout speed.
 
     Returns:
-        list: The evaluated results of the output tasks.
+        graphviz.Digraph: Graph of pipeline tasks.
     """
+    digest = __graph_digest(pipeline), fast
+    cached = _graphs.get(pipeline)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+    dot = __create_graph(pipeline)
+    if fast:
+        dot.attr('graph', splines='line', nslimit='1', nslimit1='1', ranksep='0.4')
+    _graphs[pipeline] = (digest, dot)
+    return dot
+
+
+def __graph_digest(pipeline: Pipeline) -> tuple:
+    tasks = tuple(
+        (
+            id(task),
+            task.name,
+            task.task.name if isinstance(task, TaskReference) else None,
+            tuple((id(parent), parent.name) for parent in task.parent_tasks),
+        )
+        for task in pipeline.tasks
+    )
+    stops = tuple((name, id(stop)) for name, stop in (pipeline.conditional_stops or {}).items())
+    return tasks, stops
+
+
+def __create_graph(pipeline: Pipeline):
+    try:
+        import graphviz
+    except ImportError as error:
+        raise ImportError(_MISSING_DEPENDENCY_MESSAGE) from error
     dot = graphviz.Digraph(strict=False, format='png')
+    node_names = dict()
     for task in pipeline.tasks:
         if isinstance(task, TaskReference):
             task = task.task
+        if id(task) in node_names:
+            continue
+        node_names[id(task)] = __get_node_name(task)
         label = task.name
         color="black"
         if pipeline.conditional_stops:
             if task.name in pipeline.conditional_stops:
                 stop = pipeline.conditional_stops[task.name]
                 label, color = __update_node_attrs_for_stop(stop, label)
-        dot.node(__get_node_name(task), label=label, color=color)
+        dot.node(node_names[id(task)], label=label, color=color)
 
     created_edges = set()
     for task in pipeline.tasks:
-        if isinstance(task, Task):
-            if isinstance(task, TaskReference):
-                task = task.task
-            for arg in task.args + tuple(task.kwargs.values()):
-                if not isinstance(arg, Task):
-                    continue
-                edge, edge_kwargs = __define_edge(task, arg)
-                label = edge_kwargs.get("label", None)
-                if (edge, label) not in created_edges:
-                    dot.edge(*edge,  **edge_kwargs)
-                    created_edges.add((edge, label))
+        if isinstance(task, TaskReference):
+            task = task.task
+        for arg in task.parent_tasks:
+            edge, edge_kwargs = __define_edge(task, arg, node_names)
+            label = edge_kwargs.get("label", None)
+            if (edge, label) not in created_edges:
+                dot.edge(*edge,  **edge_kwargs)
+                created_edges.add((edge, label))
     return dot
 
 
-def __define_edge(task_to: Task, task_from: Task):
+def __define_edge(task_to: Task, task_from: Task, node_names: dict[int, str]):
     if isinstance(task_from, TaskReference):
-        edge = __get_node_name(task_from.task), __get_node_name(task_to)
+        edge = node_names[id(task_from.task)], node_names[id(task_to)]
         edge_kwargs = dict(label=task_from.name)
     else: # Normal Task
-        edge = __get_node_name(task_from), __get_node_name(task_to)
+        edge = node_names[id(task_from)], node_names[id(task_to)]
         edge_kwargs= dict(color='black')
     return edge,edge_kwargs
 
@@ -15,7 +15,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/WojciechBogobowicz/dagpipe",
-    packages=find_packages(exclude=['notebooks']),
+    packages=find_packages(include=['dagpipe', 'dagpipe.*']),
     include_package_data=True,
     package_data={
         'dagpipe': ['resources/*.png'],
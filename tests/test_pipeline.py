@@ -0,0 +1,128 @@
+import unittest
+
+import dagpipe
+
+
+@dagpipe.task()
+def identity(x):
+    return x
+
+
+@dagpipe.task()
+def pair(x, k=0):
+    return (x, k)
+
+
+@dagpipe.task()
+def join(*xs):
+    return xs
+
+
+def make_split(calls):
+    @dagpipe.task(outputs_num=2)
+    def split(n):
+        calls.append(n)
+        return n, n * 10
+    return split
+
+
+def never_stop(result):
+    return False
+
+
+class TestCompiledRun(unittest.TestCase):
+    """Pipelines without conditional stops and cache are executed by generated code."""
+
+    def test_argument_updates_of_non_input_task_are_used(self):
+        a = identity(1)
+        b = pair(a)
+        pipeline = dagpipe.Pipeline(a, b)
+        self.assertEqual(pipeline.run(), [(1, 0)])
+        b.update_args_if_provided(42)
+        self.assertEqual(pipeline.run(), [(42, 0)])
+        b.update_args_if_provided(a, k=7)
+        self.assertEqual(pipeline.run(), [(1, 7)])
+
+    def test_input_reference_before_sibling_runs_source_once(self):
+        calls = []
+        u, v = make_split(calls)(0)
+        pipeline = dagpipe.Pipeline(u, join(u, v))
+        results = [pipeline.run(n) for n in (1, 2, 3)]
+        self.assertEqual(results, [[(1, 10)], [(2, 20)], [(3, 30)]])
+        self.assertEqual(calls, [1, 2, 3])
+
+    def test_input_reference_after_sibling_runs_source_once(self):
+        calls = []
+        u, v = make_split(calls)(identity(1))
+        pipeline = dagpipe.Pipeline(v, join(u, v))
+        results = [pipeline.run(n) for n in (1, 2, 3)]
+        self.assertEqual(results, [[(1, 10)], [(2, 20)], [(3, 30)]])
+        self.assertEqual(calls, [1, 2, 3])
+
+    def test_runner_is_not_regenerated_by_input_updates(self):
+        u, v = make_split([])(identity(1))
+        pipeline = dagpipe.Pipeline(v, join(u, v))
+        pipeline.run(1)
+        compiled = pipeline._compiled
+        pipeline.run(2)
+        pipeline.run(3)
+        self.assertIs(pipeline._compiled, compiled)
+
+    def test_same_calls_as_generic_run(self):
+        compiled_calls, generic_calls = [], []
+        u, v = make_split(compiled_calls)(identity(1))
+        compiled = dagpipe.Pipeline(v, join(u, v))
+        u, v = make_split(generic_calls)(identity(1))
+        generic = dagpipe.Pipeline(v, join(u, v), conditional_stops={"split": never_stop})
+        for n in (1, 2):
+            self.assertEqual(compiled.run(n), generic.run(n))
+        self.assertEqual(compiled_calls, generic_calls)
+
+
+def make_counted(calls):
+    @dagpipe.task()
+    def counted(x):
+        calls.append(x)
+        return x
+    return counted
+
+
+class TestPipelineCache(unittest.TestCase):
+
+    def test_cache_enabled_after_first_run(self):
+        calls = []
+        a = identity(0)
+        pipeline = dagpipe.Pipeline(a, make_counted(calls)(a))
+        pipeline.run(1)
+        pipeline.cache = True
+        pipeline.run(1)
+        pipeline.run(1)
+        self.assertEqual(calls, [1, 1])
+
+    def test_cache_by_name_of_multi_output_task(self):
+        calls = []
+        a = identity(0)
+        u, v = make_split(calls)(a)
+        pipeline = dagpipe.Pipeline(a, join(u, v), cache={"split"})
+        self.assertEqual(pipeline.run(1), pipeline.run(1))
+        self.assertEqual(calls, [1])
+
+    def test_cacheable_task_is_memoized_once(self):
+        calls = []
+
+        @dagpipe.task(cacheable=True)
+        def square(x):
+            calls.append(x)
+            return x * x
+
+        a = identity(0)
+        b = square(a)
+        pipeline = dagpipe.Pipeline(a, b, cache=True)
+        self.assertEqual([pipeline.run(n) for n in (2, 3, 2)], [[4], [9], [4]])
+        self.assertEqual(calls, [2, 3])
+        self.assertEqual(len(b._cache), 2)
+        self.assertNotIn(id(b), pipeline._results_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()